@@ -2,8 +2,10 @@ __version__ = "1.0.3"
 __author__ = 'JoshuaMK'
 __credits__ = 'Treeki'
 
+import os
 import re
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from io import BytesIO
 from pathlib import Path
 from typing import List, Union
@@ -18,11 +20,18 @@ from pykamek.linker import Linker
 from pykamek.versionmap import VersionMapper
 
 
+_ASSIGNMENT_RE = re.compile(
+    r"^\s*([a-zA-Z0-9_<>,\-\$]+)\s*=\s*0x([a-fA-F0-9]+)\s*(#.*)?$")
+_SPLIT_NUMS = re.compile(r"([0-9]+)")
+
+
 def sorted_alphanumeric(l):
     """ Sort the given iterable in the way that humans expect."""
-    def convert(text): return int(text) if text.isdigit() else text
-    def alphanum_key(key): return [convert(c)
-                                   for c in re.split('([0-9]+)', str(key))]
+    _split = _SPLIT_NUMS.split
+
+    def alphanum_key(key):
+        s = key if isinstance(key, str) else str(key)
+        return [int(c) if c.isdigit() else c for c in _split(s)]
     return sorted(l, key=alphanum_key)
 
 
@@ -44,9 +53,10 @@ class ElfHandler(Linker):
                 if obj.is_file():
                     self.add_module(obj)
                 else:
-                    for f in sorted_alphanumeric(obj.iterdir()):
-                        if f.is_file:
-                            self.add_module(f)
+                    with os.scandir(obj) as it:
+                        entries = [e.path for e in it if e.is_file()]
+                    for f in sorted_alphanumeric(entries):
+                        self.add_module(Path(f))
 
     def __repr__(self):
         return f"repr={vars(self)}"
@@ -57,21 +67,19 @@ class ElfHandler(Linker):
     @staticmethod
     def read_externals(file: str) -> dict:
         symbolDict = {}
-        assignmentRegex = re.compile(
-            r"^\s*([a-zA-Z0-9_<>,\-\$]+)\s*=\s*0x([a-fA-F0-9]+)\s*(#.*)?$")
 
-        with open(file, "r") as f:
-            for i, line in enumerate(f.readlines()):
-                if line.strip() == "" or line.strip().startswith("#") or line.strip().startswith("//"):
+        with open(file, "r", buffering=1 << 16) as f:
+            for i, line in enumerate(f, 1):
+                stripped = line.strip()
+                if not stripped or stripped.startswith(("#", "//")):
                     continue
 
-                try:
-                    match = re.findall(assignmentRegex, line.strip())
-                    _symbol = match[0][0]
-                    _address = match[0][1]
-                except IndexError:
+                match = _ASSIGNMENT_RE.match(stripped)
+                if match is None:
                     raise InvalidDataException(
-                        f"Symbol definition {line.strip()} at line {i} is an invalid entry")
+                        f"Symbol definition {stripped} at line {i} is an invalid entry")
+
+                _symbol, _address = match.group(1), match.group(2)
 
                 try:
                     symbolDict[_symbol] = int(_address, 16)
@@ -82,6 +90,41 @@ class ElfHandler(Linker):
         return symbolDict
 
 
+def _link_version(versionKey: str, mapper: AddressMapper, elfFiles: list,
+                  externals: dict, baseAddr: int, dolBytes: bytes,
+                  outputs: set) -> tuple:
+    print(f"Linking version {versionKey}")
+
+    elfConverter = ElfHandler(mapper, elfFiles)
+
+    if baseAddr:
+        elfConverter.link_static(externals, baseAddr)
+    else:
+        elfConverter.link_dynamic(externals)
+
+    kb = KamekBinary()
+    kb.load_from_linker(elfConverter)
+
+    results = {}
+    if "kamek" in outputs:
+        results["kamek"] = kb.pack().getvalue()
+    if "riiv" in outputs:
+        results["riiv"] = kb.pack_riivo()
+    if "gecko" in outputs:
+        results["gecko"] = kb.pack_gecko_codes()
+    if "code" in outputs:
+        results["code"] = bytes(kb.rawCode)
+    if "dol" in outputs:
+        dol = DolFile(BytesIO(dolBytes))
+        kb.apply_to_dol(dol)
+
+        patched = BytesIO()
+        dol.save(patched)
+        results["dol"] = patched.getvalue()
+
+    return versionKey, results
+
+
 def main(args: list):
     parser = ArgumentParser(
         f"pykamek {__version__}", description="ELF to Kuribo module converter")
@@ -162,38 +205,50 @@ def main(args: list):
     if _inputDolPath is None and _outputDolPath:
         parser.error("Input DOL path not specified")
 
-    for versionKey in _versionMap.mappers:
-        print(f"Linking version {versionKey}")
-
-        elfConverter = ElfHandler(_versionMap.mappers[versionKey], args.elf)
-
-        if _baseAddr:
-            elfConverter.link_static(_externals, _baseAddr)
-        else:
-            elfConverter.link_dynamic(_externals)
-
-        kb = KamekBinary()
-        kb.load_from_linker(elfConverter)
-        if _outputKamekPath:
-            with open(str(_outputKamekPath).replace("$KV$", versionKey), "wb") as kBinary:
-                kBinary.write(kb.pack().getvalue())
-        if _outputRiivPath:
-            with open(str(_outputRiivPath).replace("$KV$", versionKey), "w") as kBinary:
-                kBinary.write(kb.pack_riivo())
-        if _outputGeckoPath:
-            with open(str(_outputGeckoPath).replace("$KV$", versionKey), "w") as kBinary:
-                kBinary.write(kb.pack_gecko_codes())
-        if _outputCodePath:
-            with open(str(_outputCodePath).replace("$KV$", versionKey), "wb") as kBinary:
-                kBinary.write(kb.rawCode.getvalue())
-
-        if _outputDolPath:
-            dol = DolFile(BytesIO(_inputDolPath.read_bytes()))
-            kb.apply_to_dol(dol)
-
-            outPath = str(_outputDolPath).replace("$KV$", versionKey)
-
-            with open(outPath, "wb") as outDol:
-                dol.save(outDol)
+    _outputs = set()
+    if _outputKamekPath:
+        _outputs.add("kamek")
+    if _outputRiivPath:
+        _outputs.add("riiv")
+    if _outputGeckoPath:
+        _outputs.add("gecko")
+    if _outputCodePath:
+        _outputs.add("code")
+    if _outputDolPath:
+        _outputs.add("dol")
+
+    _dolBytes = _inputDolPath.read_bytes() if _outputDolPath else None
+
+    _kamekTpl = str(_outputKamekPath) if _outputKamekPath else None
+    _riivTpl = str(_outputRiivPath) if _outputRiivPath else None
+    _geckoTpl = str(_outputGeckoPath) if _outputGeckoPath else None
+    _codeTpl = str(_outputCodePath) if _outputCodePath else None
+    _dolTpl = str(_outputDolPath) if _outputDolPath else None
+
+    with ProcessPoolExecutor(max_workers=max(1, min(len(_versionMap.mappers),
+                                                    os.cpu_count() or 1))) as pool:
+        futures = [pool.submit(_link_version, versionKey,
+                               _versionMap.mappers[versionKey], args.elf,
+                               _externals, _baseAddr, _dolBytes, _outputs)
+                   for versionKey in _versionMap.mappers]
+
+        for future in as_completed(futures):
+            versionKey, results = future.result()
+
+            if _kamekTpl:
+                with open(_kamekTpl.replace("$KV$", versionKey), "wb") as kBinary:
+                    kBinary.write(results["kamek"])
+            if _riivTpl:
+                with open(_riivTpl.replace("$KV$", versionKey), "w") as kBinary:
+                    kBinary.write(results["riiv"])
+            if _geckoTpl:
+                with open(_geckoTpl.replace("$KV$", versionKey), "w") as kBinary:
+                    kBinary.write(results["gecko"])
+            if _codeTpl:
+                with open(_codeTpl.replace("$KV$", versionKey), "wb") as kBinary:
+                    kBinary.write(results["code"])
+            if _dolTpl:
+                with open(_dolTpl.replace("$KV$", versionKey), "wb") as outDol:
+                    outDol.write(results["dol"])
 
     print("Finished execution")
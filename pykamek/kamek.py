@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import struct
 from io import BytesIO
 from pathlib import Path
 
@@ -8,15 +9,19 @@ from dolreader.section import TextSection
 
 from pykamek.exceptions import (InvalidCommandException,
                                 InvalidOperationException)
-from pykamek.ioreader import (read_sbyte, read_sint16, read_sint32, read_ubyte,
-                              read_uint16, read_uint32, write_sbyte,
-                              write_sint16, write_sint32, write_ubyte,
-                              write_uint16, write_uint32)
 from pykamek.kmcommands import RelocCommand
 from pykamek.kmhooks import KHook
-from pykamek.kmword import KWord
+from pykamek.kmword import RELATIVE, KWord
 from pykamek.linker import Linker
 
+_U8 = struct.Struct(">B")
+_S8 = struct.Struct(">b")
+_U16 = struct.Struct(">H")
+_S16 = struct.Struct(">h")
+_U32 = struct.Struct(">I")
+_S32 = struct.Struct(">i")
+_HEADER = struct.Struct(">8sII")
+
 
 class KamekBinary(object):
 
@@ -24,9 +29,10 @@ class KamekBinary(object):
         if f is not None:
             self.read_ppc_code(f)
         else:
-            self.rawCode = BytesIO()
+            self.rawCode = bytearray()
 
         self.baseAddr = baseAddr
+        self._baseAddrInt = int(baseAddr)
         self.bssSize = KWord(0, KWord.Types.VALUE)
 
         self.commands = {}
@@ -42,7 +48,7 @@ class KamekBinary(object):
 
     @property
     def codeSize(self):
-        return len(self.rawCode.getbuffer())
+        return len(self.rawCode)
 
     @staticmethod
     def pack_from(linker: Linker) -> BytesIO:
@@ -50,65 +56,57 @@ class KamekBinary(object):
         kf.load_from_linker(linker)
         return kf.pack()
 
+    def view(self) -> bytearray:
+        return self.rawCode
+
+    def read_bytes(self, address: int, size: int) -> bytes:
+        offset = address - self._baseAddrInt
+        return bytes(self.rawCode[offset:offset + size])
+
     def read_u8(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_ubyte(self.rawCode)
+        return _U8.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
     def read_s8(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_sbyte(self.rawCode)
+        return _S8.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
     def read_u16(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_uint16(self.rawCode)
+        return _U16.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
     def read_s16(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_sint16(self.rawCode)
+        return _S16.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
     def read_u32(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_uint32(self.rawCode)
+        return _U32.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
     def read_s32(self, address: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        return read_sint32(self.rawCode)
-
-    def write_u8(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_ubyte(self.rawCode, val)
+        return _S32.unpack_from(self.rawCode, address - self._baseAddrInt)[0]
 
-    def write_s8(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_sbyte(self.rawCode, val)
+    def write_u8(self, address: int, val: int):
+        _U8.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
-    def write_u16(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_uint16(self.rawCode, val)
+    def write_s8(self, address: int, val: int):
+        _S8.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
-    def write_s16(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_sint16(self.rawCode, val)
+    def write_u16(self, address: int, val: int):
+        _U16.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
-    def write_u32(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_uint32(self.rawCode, val)
+    def write_s16(self, address: int, val: int):
+        _S16.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
-    def write_s32(self, address: int, val: int) -> int:
-        self.seek(address - self.baseAddr.value)
-        write_sint32(self.rawCode, val)
+    def write_u32(self, address: int, val: int):
+        _U32.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
-    def seek(self, where: int, whence: int = 0):
-        self.rawCode.seek(where, whence)
+    def write_s32(self, address: int, val: int):
+        _S32.pack_into(self.rawCode, address - self._baseAddrInt, val)
 
     def read_ppc_code(self, f: Path):
-        self.rawCode = BytesIO(f.read_bytes())
+        self.rawCode = bytearray(f.read_bytes())
 
     def contains(self, addr: KWord) -> bool:
-        return addr >= self.baseAddr and addr < (self.baseAddr + self.codeSize)
+        return self._baseAddrInt <= addr < self._baseAddrInt + len(self.rawCode)
 
     def get_symbol_size(self, addr: KWord) -> int:
-        return self.symbolSizes[addr]
+        return self.symbolSizes[(addr.type << 32) | int(addr)]
 
     def load_from_linker(self, linker: Linker):
         if self.codeSize > 0:
@@ -121,15 +119,16 @@ class KamekBinary(object):
         linker._memory.seek(linker.outputStart.value -
                             linker.baseAddress.value)
 
-        self.rawCode = BytesIO(linker._memory.read(linker.outputSize.value))
+        self.rawCode = bytearray(linker._memory.read(linker.outputSize.value))
 
         self.baseAddr = linker.baseAddress
+        self._baseAddrInt = linker.baseAddress.value
         self.bssSize = linker.bssSize
 
-        for _key in linker._symbolSizes:
-            self.symbolSizes[_key] = linker._symbolSizes[_key]
+        self.symbolSizes = {(_key.type << 32) | int(_key): _size
+                            for _key, _size in linker._symbolSizes.items()}
 
-        self.add_relocs_as_commands(linker._fixups)
+        self.add_relocs_as_commands(linker.fixups)
 
         for cmd in linker._kamekHooks:
             self.apply_hook(cmd)
@@ -137,58 +136,65 @@ class KamekBinary(object):
         self.apply_static_commands()
 
     def add_relocs_as_commands(self, relocs: list):
+        commands = self.commands
         for rel in relocs:
-            if rel.source in self.commands:
+            _key = (rel.source.type << 32) | int(rel.source)
+            cmd = RelocCommand(rel.source, rel.dest, rel.type)
+
+            if commands.setdefault(_key, cmd) is not cmd:
                 raise InvalidOperationException(
                     f"Duplicate commands for address {rel.source.value:X}")
 
-            self.commands[rel.source] = RelocCommand(
-                rel.source, rel.dest, rel.type)
-
     def apply_hook(self, hookData):
         hook = KHook.create(hookData, self.mapper)
         for cmd in hook.commands:
-            if cmd.address in self.commands:
+            _key = (cmd.address.type << 32) | int(cmd.address)
+            if _key in self.commands:
                 raise InvalidOperationException(
                     f"Duplicate commands for address {cmd.address.value:X}")
 
-            self.commands[cmd.address] = cmd
+            self.commands[_key] = cmd
         self.hooks.append(hook)
 
     def apply_static_commands(self):
-        _original = self.commands
-        self.commands = {}
+        _applied = [_key for _key, cmd in self.commands.items()
+                    if cmd.apply(self)]
 
-        for cmd in _original.values():
-            if not cmd.apply(self):
-                self.commands[cmd.address] = cmd
+        for _key in _applied:
+            del self.commands[_key]
 
     def pack(self) -> BytesIO:
-        _packedBinary = BytesIO()
-        _packedBinary.write(b"Kamek\x00\x00\x01")
-        write_uint32(_packedBinary, self.bssSize.value)
-        write_uint32(_packedBinary, self.codeSize)
+        codeSize = self.codeSize
+
+        total = 16 + codeSize
+        for cmd in self.commands.values():
+            total += (4 if cmd.address.type == RELATIVE else 8) + cmd.arg_size()
 
-        _packedBinary.write(self.rawCode.getvalue())
+        buf = bytearray(total)
+        _HEADER.pack_into(buf, 0, b"Kamek\x00\x00\x01",
+                          self.bssSize.value, codeSize)
+        buf[16:16 + codeSize] = self.rawCode
 
-        for _key in self.commands:
-            cmd = (self.commands[_key].id << 24) & 0xFFFFFFFF
-            address = self.commands[_key].address
+        offset = 16 + codeSize
+        for cmd in self.commands.values():
+            cmdWord = (cmd.id << 24) & 0xFFFFFFFF
+            address = cmd.address
 
-            if address.is_relative_addr():
+            if address.type == RELATIVE:
                 if address > 0xFFFFFF:
                     raise InvalidCommandException(
                         f"Given address {address} is too high for packed command")
 
-                write_uint32(_packedBinary, cmd | address.value)
+                _U32.pack_into(buf, offset, cmdWord | address.value)
+                offset += 4
             else:
-                write_uint32(_packedBinary, cmd | 0xFFFFFE)
-                write_uint32(_packedBinary, address.value)
+                _U32.pack_into(buf, offset, cmdWord | 0xFFFFFE)
+                _U32.pack_into(buf, offset + 4, address.value)
+                offset += 8
 
-            self.commands[_key].write_arguments(_packedBinary)
+            offset = cmd.write_arguments_into(buf, offset)
 
-        _packedBinary.seek(0)
-        return _packedBinary
+        return BytesIO(buf)
 
     def pack_riivo(self) -> str:
         pass
@@ -197,11 +203,11 @@ class KamekBinary(object):
         pass
 
     def apply_to_dol(self, dol: DolFile):
-        if self.baseAddr.type == KWord.Types.RELATIVE:
+        if self.baseAddr.type == RELATIVE:
             raise InvalidOperationException(
                 "Cannot pack a dynamically linked binary into a DOL")
 
         dol.append_section(TextSection(self.baseAddr.value, self.rawCode))
 
-        for _key in self.commands:
-            self.commands[_key].apply_to_dol(dol, self.mapper)
+        for cmd in self.commands.values():
+            cmd.apply_to_dol(dol, self.mapper)
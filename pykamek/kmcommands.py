@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from io import BytesIO
+import struct
 
 from dolreader.dol import DolFile
 from dolreader.exceptions import UnmappedAddressError
@@ -11,8 +11,17 @@ from pykamek.ioreader import (read_ubyte, read_uint16, read_uint32,
                               write_ubyte, write_uint16, write_uint32)
 from pykamek.kmword import KWord
 
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_PACK_U16 = _U16.pack
+_PACK_U32 = _U32.pack
+_2U32 = struct.Struct(">II")
+
 
 class Command(object):
+
+    __slots__ = ("id", "address")
+
     class KCmdID:
         Null = 0
 
@@ -41,30 +50,47 @@ class Command(object):
         self.address = address
 
 
+_ID_BRANCH = Command.KCmdID.Branch
+_ID_BRANCHLINK = Command.KCmdID.BranchLink
+_ID_REL24 = Command.KCmdID.Rel24
+_ID_ADDR32 = Command.KCmdID.Addr32
+_ID_ADDR16LO = Command.KCmdID.Addr16Lo
+_ID_ADDR16HI = Command.KCmdID.Addr16Hi
+_ID_ADDR16HA = Command.KCmdID.Addr16Ha
+
+
 class BranchCommand(Command):
+
+    __slots__ = ("target", "_eqRelocTypes")
+
     def __init__(self, source: KWord, target: KWord, isLink: bool):
-        kId = Command.KCmdID.BranchLink if isLink else Command.KCmdID.Branch
+        kId = _ID_BRANCHLINK if isLink else _ID_BRANCH
         super().__init__(kId, source)
         self.target = target
+        self._eqRelocTypes = source.type == target.type
 
     def __repr__(self) -> str:
-        return f"repr={vars(self)}"
+        return f"repr=({self.id}, {self.address}, {self.target})"
 
     def __str__(self) -> str:
         return f"Branch Command; {self.__repr__()}"
 
-    def write_arguments(self, io: BytesIO):
+    def arg_size(self) -> int:
+        return 4
+
+    def write_arguments_into(self, buf: bytearray, offset: int) -> int:
         self.target.assert_not_ambiguous()
-        write_uint32(io, self.target.value)
+        _U32.pack_into(buf, offset, self.target.value)
+        return offset + 4
 
     def is_equal_reloc_types(self) -> bool:
-        return self.address.type == self.target.type
+        return self._eqRelocTypes
 
     def is_equal_reloc_absolute(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_absolute_addr()
+        return self._eqRelocTypes and self.target.is_absolute_addr()
 
     def is_equal_reloc_relative(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_relative_addr()
+        return self._eqRelocTypes and self.target.is_relative_addr()
 
     def apply(self, f: "KamekBinary"):
         if self.is_equal_reloc_absolute() and f.contains(self.address):
@@ -80,50 +106,57 @@ class BranchCommand(Command):
         self.address.assert_absolute()
         self.target.assert_absolute()
 
-        code = ((self.address.value & 0x1FFFFFF) <<
-                32) | self._generate_instruction()
-
-        return list(code | (0x4000000 << 32))
+        return [0x4000000 | (self.address.value & 0x1FFFFFF),
+                self._generate_instruction()]
 
     def apply_to_dol(self, dol: DolFile, linker: "Linker"):
         self.address.assert_absolute()
         self.target.assert_absolute()
 
         dol.seek(self.address.value)
-        write_uint32(dol, self._generate_instruction())
+        dol.write(_PACK_U32(self._generate_instruction()))
 
     def _generate_instruction(self) -> int:
-        delta = self.target - self.address
-        insn = 0x48000001 if self.id == Command.KCmdID.BranchLink else 0x48000000
-        return insn | (delta.value & 0x3FFFFFC)
+        delta = self.target.value - self.address.value
+        insn = 0x48000001 if self.id == _ID_BRANCHLINK else 0x48000000
+        return insn | (delta & 0x3FFFFFC)
 
 
 class PatchExitCommand(Command):
+
+    __slots__ = ("target", "endAddress", "_eqRelocTypes")
+
     def __init__(self, source: KWord, target: KWord):
-        super().__init__(Command.KCmdID.Branch, source)
+        super().__init__(_ID_BRANCH, source)
         self.target = target
         self.endAddress = KWord(0, KWord.Types.ABSOLUTE)
+        # endAddress is always derived from address in apply, so the
+        # three-way type check collapses to source vs target
+        self._eqRelocTypes = source.type == target.type
 
     def __repr__(self) -> str:
-        return f"repr={vars(self)}"
+        return f"repr=({self.id}, {self.address}, {self.target}, {self.endAddress})"
 
     def __str__(self) -> str:
         return f"Exit Patch Command; {self.__repr__()}"
 
-    def write_arguments(self, io: BytesIO):
+    def arg_size(self) -> int:
+        return 8
+
+    def write_arguments_into(self, buf: bytearray, offset: int) -> int:
         self.endAddress.assert_not_ambiguous()
         self.target.assert_not_ambiguous()
-        write_uint32(io, self.endAddress.value)
-        write_uint32(io, self.target.value)
+        _2U32.pack_into(buf, offset, self.endAddress.value, self.target.value)
+        return offset + 8
 
     def is_equal_reloc_types(self) -> bool:
-        return self.address.type == self.target.type == self.endAddress.type
+        return self._eqRelocTypes
 
     def is_equal_reloc_absolute(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_absolute_addr()
+        return self._eqRelocTypes and self.target.is_absolute_addr()
 
     def is_equal_reloc_relative(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_relative_addr()
+        return self._eqRelocTypes and self.target.is_relative_addr()
 
     def apply(self, f: "KamekBinary") -> bool:
         funcSize = f.get_symbol_size(self.address)
@@ -132,16 +165,14 @@ class PatchExitCommand(Command):
         if funcSize < 4:
             raise InvalidOperationException("Queried function is too small")
 
-        if f.read_u32(funcEnd) != 0x4E800020:
+        body = f.read_bytes(self.address.value, funcSize)
+        if struct.unpack_from(">I", body, funcSize - 4)[0] != 0x4E800020:
             raise InvalidOperationException("Function does not end in blr")
 
-        instrLoc = self.address
-        while instrLoc < funcEnd:
-            insn = f.read_u32(instrLoc)
+        for insn, in struct.iter_unpack(">I", body[:(funcSize - 4) & -4]):
             if (insn & 0xFC00FFFF == 0x4C000020):
                 raise InvalidOperationException(
                     "Function contains a return partway through")
-            instrLoc += 4
 
         self.endAddress = funcEnd
         if self.is_equal_reloc_absolute() and f.contains(self.address):
@@ -181,18 +212,21 @@ class PatchExitCommand(Command):
         try:
             dol.resolve_address(self.address)
             dol.seek(self.endAddress.value)
-            write_uint32(dol, self._generate_instruction())
+            dol.write(_PACK_U32(self._generate_instruction()))
             return True
         except UnmappedAddressError:
             return False
 
     def _generate_instruction(self) -> int:
-        delta = self.target - self.address
-        insn = 0x48000001 if self.id == Command.KCmdID.BranchLink else 0x48000000
-        return insn | (delta.value & 0x3FFFFFC)
+        delta = self.target.value - self.address.value
+        insn = 0x48000001 if self.id == _ID_BRANCHLINK else 0x48000000
+        return insn | (delta & 0x3FFFFFC)
 
 
 class WriteCommand(Command):
+
+    __slots__ = ("value", "valueType", "original")
+
     class Type:
         Pointer = 1
         Value32 = 2
@@ -200,56 +234,43 @@ class WriteCommand(Command):
         Value8 = 4
 
     def __init__(self, address: KWord, value: KWord, valueType: Type, original: KWord = None):
-        super().__init__(self.id_from_type(valueType, original != None), address)
+        super().__init__(self.id_from_type(valueType, original is not None), address)
         self.value = value
         self.valueType = valueType
-
-        if original:
-            self.original = original
-        else:
-            self.original = None
+        self.original = original
 
     def __repr__(self) -> str:
-        return f"repr={vars(self)}"
+        return (f"repr=({self.id}, {self.address}, {self.value},"
+                f" {self.valueType}, {self.original})")
 
     def __str__(self) -> str:
         return f"Write Command; {self.__repr__()}"
 
     @staticmethod
     def id_from_type(_type: Type, isConditional: bool) -> Type:
-        if isConditional:
-            if _type == WriteCommand.Type.Pointer:
-                return Command.KCmdID.CondWritePointer
-            elif _type == WriteCommand.Type.Value32:
-                return Command.KCmdID.CondWrite32
-            elif _type == WriteCommand.Type.Value16:
-                return Command.KCmdID.CondWrite16
-            elif _type == WriteCommand.Type.Value8:
-                return Command.KCmdID.CondWrite8
-        else:
-            if _type == WriteCommand.Type.Pointer:
-                return Command.KCmdID.WritePointer
-            elif _type == WriteCommand.Type.Value32:
-                return Command.KCmdID.Write32
-            elif _type == WriteCommand.Type.Value16:
-                return Command.KCmdID.Write16
-            elif _type == WriteCommand.Type.Value8:
-                return Command.KCmdID.Write8
-
-        raise NotImplementedError(
-            f"Unimplemented command type {_type} specified")
-
-    def write_arguments(self, io: BytesIO):
+        try:
+            return _WRITE_ID_TABLE[(_type, isConditional)]
+        except KeyError:
+            raise NotImplementedError(
+                f"Unimplemented command type {_type} specified")
+
+    def arg_size(self) -> int:
+        return 4 if self.original is None else 8
+
+    def write_arguments_into(self, buf: bytearray, offset: int) -> int:
         if self.valueType == WriteCommand.Type.Pointer:
             self.value.assert_not_ambiguous()
         else:
             self.value.assert_value()
 
-        write_uint32(io, self.value.value)
-
         if self.original is not None:
             self.original.assert_not_relative()
-            write_uint32(io, self.original.value)
+            _2U32.pack_into(buf, offset, self.value.value,
+                            self.original.value)
+            return offset + 8
+
+        _U32.pack_into(buf, offset, self.value.value)
+        return offset + 4
 
     def apply(self, f: "KamekBinary") -> bool:
         return False
@@ -261,30 +282,18 @@ class WriteCommand(Command):
         else:
             self.value.assert_value()
 
+        try:
+            _, _, width = _WRITE_DISPATCH[self.valueType]
+        except KeyError:
+            raise InvalidOperationException(
+                f"Invalid command type {self.valueType} specified")
+
         if self.original is not None:
             self.original.assert_not_relative()
+            return (f"<memory offset='0x{self.address:X8}' value='{self.value:{width}}'"
+                    f" original='{self.original:{width}}' />")
 
-            if self.valueType == WriteCommand.Type.Value8:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X2}' original='{self.original:X2}' />"
-            elif self.valueType == WriteCommand.Type.Value16:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X4}' original='{self.original:X4}' />"
-            elif self.valueType == WriteCommand.Type.Value32:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X8}' original='{self.original:X8}' />"
-            elif self.valueType == WriteCommand.Type.Pointer:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X8}' original='{self.original:X8}' />"
-
-        else:
-            if self.valueType == WriteCommand.Type.Value8:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X2}' />"
-            elif self.valueType == WriteCommand.Type.Value16:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X4}' />"
-            elif self.valueType == WriteCommand.Type.Value32:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X8}' />"
-            elif self.valueType == WriteCommand.Type.Pointer:
-                return f"<memory offset='0x{self.address:X8}' value='{self.value:X8}' />"
-
-        raise InvalidOperationException(
-            f"Invalid command type {self.valueType} specified")
+        return f"<memory offset='0x{self.address:X8}' value='{self.value:{width}}' />"
 
     def pack_gecko_codes(self) -> list:
         self.address.assert_absolute()
@@ -300,17 +309,13 @@ class WriteCommand(Command):
             raise NotImplementedError(
                 "MEM2 writes not yet supported for gecko")
 
-        code = ((self.address.value & 0x1FFFFFF) << 32) | self.value.value
-
-        if self.valueType == WriteCommand.Type.Value16:
-            return list(code | (0x2000000 << 32))
-        elif self.valueType == WriteCommand.Type.Value32:
-            return list(code | (0x4000000 << 32))
-        elif self.valueType == WriteCommand.Type.Pointer:
-            return list(code | (0x4000000 << 32))
+        try:
+            flag = _GECKO_WRITE_FLAGS[self.valueType]
+        except KeyError:
+            raise InvalidOperationException(
+                f"Invalid command type {self.valueType} specified")
 
-        raise InvalidOperationException(
-            f"Invalid command type {self.valueType} specified")
+        return [flag | (self.address.value & 0x1FFFFFF), self.value.value]
 
     def apply_to_dol(self, dol: DolFile, linker: "Linker"):
         self.address.assert_absolute()
@@ -319,102 +324,78 @@ class WriteCommand(Command):
         else:
             self.value.assert_value()
 
+        reader, writer, _ = _WRITE_DISPATCH[self.valueType]
+
         if self.original is not None:
-            shouldPatch = False
-
-            if self.valueType == WriteCommand.Type.Value8:
-                dol.seek(self.address.value)
-                shouldPatch = self.original == read_ubyte(dol)
-            elif self.valueType == WriteCommand.Type.Value16:
-                dol.seek(self.address.value)
-                shouldPatch = self.original == read_uint16(dol)
-            elif self.valueType == WriteCommand.Type.Value32:
-                dol.seek(self.address.value)
-                shouldPatch = self.original == read_uint32(dol)
-            elif self.valueType == WriteCommand.Type.Pointer:
-                dol.seek(self.address.value)
-                shouldPatch = self.original == read_uint32(dol)
-
-            if not shouldPatch:
+            dol.seek(self.address.value)
+            if self.original != reader(dol):
                 return
 
-        if self.valueType == WriteCommand.Type.Value8:
-            dol.seek(self.address.value)
-            write_ubyte(dol, self.value.value)
-        elif self.valueType == WriteCommand.Type.Value16:
-            dol.seek(self.address.value)
-            write_uint16(dol, self.value.value)
-        elif self.valueType == WriteCommand.Type.Value32:
-            dol.seek(self.address.value)
-            write_uint32(dol, self.value.value)
-        elif self.valueType == WriteCommand.Type.Pointer:
-            dol.seek(self.address.value)
-            write_uint32(dol, self.value.value)
+        dol.seek(self.address.value)
+        writer(dol, self.value.value)
+
+
+# (reader, writer, riivolution hex width) per write type
+_WRITE_DISPATCH = {
+    WriteCommand.Type.Value8: (read_ubyte, write_ubyte, "X2"),
+    WriteCommand.Type.Value16: (read_uint16, write_uint16, "X4"),
+    WriteCommand.Type.Value32: (read_uint32, write_uint32, "X8"),
+    WriteCommand.Type.Pointer: (read_uint32, write_uint32, "X8"),
+}
+
+# gecko write opcodes by value type; 8-bit writes have no direct encoding
+_GECKO_WRITE_FLAGS = {
+    WriteCommand.Type.Value16: 0x2000000,
+    WriteCommand.Type.Value32: 0x4000000,
+    WriteCommand.Type.Pointer: 0x4000000,
+}
+
+_WRITE_ID_TABLE = {
+    (WriteCommand.Type.Pointer, False): Command.KCmdID.WritePointer,
+    (WriteCommand.Type.Value32, False): Command.KCmdID.Write32,
+    (WriteCommand.Type.Value16, False): Command.KCmdID.Write16,
+    (WriteCommand.Type.Value8, False): Command.KCmdID.Write8,
+    (WriteCommand.Type.Pointer, True): Command.KCmdID.CondWritePointer,
+    (WriteCommand.Type.Value32, True): Command.KCmdID.CondWrite32,
+    (WriteCommand.Type.Value16, True): Command.KCmdID.CondWrite16,
+    (WriteCommand.Type.Value8, True): Command.KCmdID.CondWrite8,
+}
 
 
 class RelocCommand(Command):
+
+    __slots__ = ("target", "_eqRelocTypes")
+
     def __init__(self, source: KWord, target: KWord, reloc: ELFFlags.Reloc):
         super().__init__(reloc, source)
         self.target = target
+        self._eqRelocTypes = source.type == target.type
 
     def __repr__(self) -> str:
-        return f"repr={vars(self)}"
+        return f"repr=({self.id}, {self.address}, {self.target})"
 
     def __str__(self) -> str:
         return f"Relocation Command; {self.__repr__()}"
 
     def is_equal_reloc_types(self) -> bool:
-        return self.address.type == self.target.type
+        return self._eqRelocTypes
 
     def is_equal_reloc_absolute(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_absolute_addr()
+        return self._eqRelocTypes and self.target.is_absolute_addr()
 
     def is_equal_reloc_relative(self) -> bool:
-        return self.is_equal_reloc_types() and self.target.is_relative_addr()
+        return self._eqRelocTypes and self.target.is_relative_addr()
 
-    def write_arguments(self, io: BytesIO):
+    def arg_size(self) -> int:
+        return 4
+
+    def write_arguments_into(self, buf: bytearray, offset: int) -> int:
         self.target.assert_not_ambiguous()
-        write_uint32(io, self.target.value)
+        _U32.pack_into(buf, offset, self.target.value)
+        return offset + 4
 
     def apply(self, f: "KamekBinary") -> bool:
-        if self.id == Command.KCmdID.Rel24:
-            if self.is_equal_reloc_types() and not self.target.is_value():
-                delta = self.target - self.address
-
-                insn = (delta & 0x3FFFFFC) | (
-                    f.read_u32(self.address.value) & 0xFC000003)
-                f.write_u32(self.address.value, insn.value)
-                return True
-
-        elif self.id == Command.KCmdID.Addr32:
-            if self.target.is_absolute_addr():
-                f.write_u32(self.address.value, self.target.value)
-                return True
-
-        elif self.id == Command.KCmdID.Addr16Lo:
-            if self.target.is_absolute_addr():
-                f.write_u16(self.address.value, self.target.value & 0xFFFF)
-                return True
-
-        elif self.id == Command.KCmdID.Addr16Hi:
-            if self.target.is_absolute_addr():
-                f.write_u16(self.address.value,
-                            (self.target.value >> 16) & 0xFFFF)
-                return True
-
-        elif self.id == Command.KCmdID.Addr16Ha:
-            if self.target.is_absolute_addr():
-                aTarget = (self.target.value >> 16) & 0xFFFF
-                if self.target & 0x8000 == 0x8000:
-                    aTarget += 1
-
-                f.write_u16(self.address.value, aTarget)
-                return True
-
-        else:
-            raise NotImplementedError("Unrecognized relocation type")
-
-        return False
+        return _RELOC_HANDLERS.get(self.id, _reloc_unknown)(self, f)
 
     def pack_riivo(self) -> str:
         raise NotImplementedError()
@@ -426,33 +407,103 @@ class RelocCommand(Command):
         self.address.assert_absolute()
         self.target.assert_absolute()
 
-        if self.id == Command.KCmdID.Rel24:
-            delta = self.target - self.address
+        _RELOC_DOL_HANDLERS.get(self.id, _reloc_unknown)(self, dol)
 
-            dol.seek(self.address.value)
-            insn = (delta & 0x3FFFFFC) | (read_uint32(dol) & 0xFC000003)
-            dol.seek(self.address.value)
-            write_uint32(dol, insn.value)
 
-        elif self.id == Command.KCmdID.Addr32:
-            dol.seek(self.address.value)
-            write_uint32(dol, self.target.value)
+def _reloc_unknown(cmd, _):
+    raise NotImplementedError("Unrecognized relocation type")
 
-        elif self.id == Command.KCmdID.Addr16Lo:
-            dol.seek(self.address.value)
-            write_uint16(dol, self.target.value & 0xFFFF)
 
-        elif self.id == Command.KCmdID.Addr16Hi:
-            dol.seek(self.address.value)
-            write_uint16(dol, (self.target.value >> 16) & 0xFFFF)
+def _ha(value: int) -> int:
+    return ((value + 0x8000) >> 16) & 0xFFFF
 
-        elif self.id == Command.KCmdID.Addr16Ha:
-            aTarget = (self.target.value >> 16) & 0xFFFF
-            if self.target & 0x8000 == 0x8000:
-                aTarget += 1
 
-            dol.seek(self.address.value)
-            write_uint16(dol, aTarget)
+def _apply_rel24(cmd, f):
+    if cmd.is_equal_reloc_types() and not cmd.target.is_value():
+        offset = cmd.address.value - f.baseAddr.value
+        buf = f.view()
 
-        else:
-            raise NotImplementedError("Unrecognized relocation type")
+        delta = cmd.target.value - cmd.address.value
+        insn = (delta & 0x3FFFFFC) | (_U32.unpack_from(buf, offset)[0] &
+                                      0xFC000003)
+        _U32.pack_into(buf, offset, insn)
+        return True
+    return False
+
+
+def _apply_addr32(cmd, f):
+    if cmd.target.is_absolute_addr():
+        _U32.pack_into(f.view(), cmd.address.value - f.baseAddr.value,
+                       cmd.target.value)
+        return True
+    return False
+
+
+def _apply_addr16_lo(cmd, f):
+    if cmd.target.is_absolute_addr():
+        _U16.pack_into(f.view(), cmd.address.value - f.baseAddr.value,
+                       cmd.target.value & 0xFFFF)
+        return True
+    return False
+
+
+def _apply_addr16_hi(cmd, f):
+    if cmd.target.is_absolute_addr():
+        _U16.pack_into(f.view(), cmd.address.value - f.baseAddr.value,
+                       (cmd.target.value >> 16) & 0xFFFF)
+        return True
+    return False
+
+
+def _apply_addr16_ha(cmd, f):
+    if cmd.target.is_absolute_addr():
+        _U16.pack_into(f.view(), cmd.address.value - f.baseAddr.value,
+                       _ha(cmd.target.value))
+        return True
+    return False
+
+
+def _apply_rel24_dol(cmd, dol):
+    delta = cmd.target - cmd.address
+
+    dol.seek(cmd.address.value)
+    insn = (delta & 0x3FFFFFC) | (read_uint32(dol) & 0xFC000003)
+    dol.seek(cmd.address.value)
+    dol.write(_PACK_U32(insn.value))
+
+
+def _apply_addr32_dol(cmd, dol):
+    dol.seek(cmd.address.value)
+    dol.write(_PACK_U32(cmd.target.value))
+
+
+def _apply_addr16_lo_dol(cmd, dol):
+    dol.seek(cmd.address.value)
+    dol.write(_PACK_U16(cmd.target.value & 0xFFFF))
+
+
+def _apply_addr16_hi_dol(cmd, dol):
+    dol.seek(cmd.address.value)
+    dol.write(_PACK_U16((cmd.target.value >> 16) & 0xFFFF))
+
+
+def _apply_addr16_ha_dol(cmd, dol):
+    dol.seek(cmd.address.value)
+    dol.write(_PACK_U16(_ha(cmd.target.value)))
+
+
+_RELOC_HANDLERS = {
+    _ID_REL24: _apply_rel24,
+    _ID_ADDR32: _apply_addr32,
+    _ID_ADDR16LO: _apply_addr16_lo,
+    _ID_ADDR16HI: _apply_addr16_hi,
+    _ID_ADDR16HA: _apply_addr16_ha,
+}
+
+_RELOC_DOL_HANDLERS = {
+    _ID_REL24: _apply_rel24_dol,
+    _ID_ADDR32: _apply_addr32_dol,
+    _ID_ADDR16LO: _apply_addr16_lo_dol,
+    _ID_ADDR16HI: _apply_addr16_hi_dol,
+    _ID_ADDR16HA: _apply_addr16_ha_dol,
+}
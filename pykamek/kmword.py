@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from pykamek.exceptions import InvalidOperationException
 
+VALUE = 1
+ABSOLUTE = 2
+RELATIVE = 3
 
-class KWord(object):
+
+class KWord(int):
     class Types:
-        VALUE = 1
-        ABSOLUTE = 2
-        RELATIVE = 3
+        VALUE = VALUE
+        ABSOLUTE = ABSOLUTE
+        RELATIVE = RELATIVE
 
-    def __init__(self, value: int = 0, _type: KWord.Types = Types.VALUE, signed: bool = False):
+    def __new__(cls, value: int = 0, _type: KWord.Types = Types.VALUE, signed: bool = False) -> KWord:
         """
         Returns a 32bit clamped `KWord` object
 
@@ -20,158 +24,77 @@ class KWord(object):
         signed; Is this KWord signed or unsigned - NOTE: Is automatically unsigned if value is > 0x7FFFFFFF
         """
 
-        if isinstance(value, KWord):
-            value = value.value
-        else:
-            value = int(value)
-
+        self = int.__new__(cls, int(value) & 0xFFFFFFFF)
         self.type = _type
         self.signed = signed and value < 0x7FFFFFFF
-
-        if value > 0xFFFFFFFF or value < -0x7FFFFFFF:
-            raise ValueError(f"'{value}' is too extreme for a 32bit number")
-
-        self._value = self.__clamp(value)
+        return self
 
     @property
     def value(self) -> int:
-        return self.__expand(self._value)
-
-    @value.setter
-    def value(self, value: int):
-        self._value = self.__clamp(value)
+        value = int(self)
+        if self.signed:
+            return (value ^ 0x80000000) - 0x80000000
+        return value
 
     def __repr__(self) -> str:
-        return f"repr=(Value: {self.__expand(self._value)}, {vars(self)})"
+        return f"repr=(Value: {self.value}, type={self.type}, signed={self.signed})"
 
     def __str__(self) -> str:
         return f"Kamek extended integer; {self.__repr__()}"
 
     def __add__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value + self.__retrieve_value(other)), self.type)
+        return KWord(int.__add__(self, int(other)), self.type, self.signed)
 
     def __sub__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value - self.__retrieve_value(other)), self.type)
+        return KWord(int.__sub__(self, int(other)), self.type, self.signed)
 
     def __mul__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value * self.__retrieve_value(other)), self.type)
+        return KWord(int.__mul__(self, int(other)), self.type, self.signed)
 
     def __truediv__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value / self.__retrieve_value(other)), self.type)
+        return KWord(int(int.__truediv__(self, int(other))), self.type, self.signed)
 
     def __floordiv__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value // self.__retrieve_value(other)), self.type)
+        return KWord(int.__floordiv__(self, int(other)), self.type, self.signed)
 
     def __mod__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value % self.__retrieve_value(other)), self.type)
+        return KWord(int.__mod__(self, int(other)), self.type, self.signed)
 
     def __pow__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value ** self.__retrieve_value(other)), self.type)
+        return KWord(int.__pow__(self, int(other)), self.type, self.signed)
 
     def __rshift__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value >> self.__retrieve_value(other)), self.type)
+        return KWord(int.__rshift__(self, int(other)), self.type, self.signed)
 
     def __lshift__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value << self.__retrieve_value(other)), self.type)
+        return KWord(int.__lshift__(self, int(other)), self.type, self.signed)
 
     def __and__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value & self.__retrieve_value(other)), self.type)
+        return KWord(int.__and__(self, int(other) & 0xFFFFFFFF), self.type, self.signed)
 
     def __or__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value | self.__retrieve_value(other)), self.type)
+        return KWord(int.__or__(self, int(other) & 0xFFFFFFFF), self.type, self.signed)
 
     def __xor__(self, other: KWord) -> KWord:
-        return KWord(self.__clamp(self.value ^ self.__retrieve_value(other)), self.type)
-
-    def __lt__(self, other: KWord) -> bool:
-        return self.value < self.__retrieve_value(other)
-
-    def __gt__(self, other: KWord) -> bool:
-        return self.value > self.__retrieve_value(other)
-
-    def __le__(self, other: KWord) -> bool:
-        return self.value <= self.__retrieve_value(other)
-
-    def __ge__(self, other: KWord) -> bool:
-        return self.value >= self.__retrieve_value(other)
-
-    def __eq__(self, other: KWord) -> bool:
-        return self.value == self.__retrieve_value(other)
-
-    def __ne__(self, other: KWord) -> bool:
-        return self.value != self.__retrieve_value(other)
-
-    def __iadd__(self, other: KWord):
-        self.value = self.__clamp(self._value + self.__retrieve_value(other))
-        return self
-
-    def __isub__(self, other: KWord):
-        self.value = self.__clamp(self._value - self.__retrieve_value(other))
-        return self
-
-    def __imul__(self, other: KWord):
-        self.value = self.__clamp(self._value * self.__retrieve_value(other))
-        return self
-
-    def __idiv__(self, other: KWord):
-        self.value = self.__clamp(self._value / self.__retrieve_value(other))
-        return self
-
-    def __ifloordiv__(self, other: KWord):
-        self.value = self.__clamp(self._value // self.__retrieve_value(other))
-        return self
-
-    def __imod__(self, other: KWord):
-        self.value = self.__clamp(self._value % self.__retrieve_value(other))
-        return self
-
-    def __ipow__(self, other: KWord):
-        self.value = self.__clamp(self._value ** self.__retrieve_value(other))
-        return self
-
-    def __irshift__(self, other: KWord):
-        self.value = self.__clamp(self._value >> self.__retrieve_value(other))
-        return self
-
-    def __ilshift__(self, other: KWord):
-        self.value = self.__clamp(self._value << self.__retrieve_value(other))
-        return self
-
-    def __iand__(self, other: KWord):
-        self.value = self.__clamp(self._value & self.__retrieve_value(other))
-        return self
-
-    def __ior__(self, other: KWord):
-        self.value = self.__clamp(self._value | self.__retrieve_value(other))
-        return self
-
-    def __ixor__(self, other: KWord):
-        self.value = self.__clamp(self._value ^ self.__retrieve_value(other))
-        return self
+        return KWord(int.__xor__(self, int(other) & 0xFFFFFFFF), self.type, self.signed)
 
     def __neg__(self) -> KWord:
-        return KWord(-self.value & 0xFFFFFFFF, self.type)
+        return KWord(int.__neg__(self), self.type, self.signed)
 
     def __pos__(self) -> KWord:
-        return KWord(+self.value & 0xFFFFFFFF, self.type)
+        return KWord(int(self), self.type, self.signed)
 
     def __invert__(self) -> KWord:
-        return KWord(~self.value & 0xFFFFFFFF, self.type)
-
-    def __hash__(self):
-        return hash(self.value + (self.type << 32))
-
-    def __format__(self, fmt) -> str:
-        return f"{self.value:{fmt}}"
+        return KWord(int.__invert__(self), self.type, self.signed)
 
     def is_absolute_addr(self) -> bool:
-        return self.type == KWord.Types.ABSOLUTE
+        return self.type == ABSOLUTE
 
     def is_relative_addr(self) -> bool:
-        return self.type == KWord.Types.RELATIVE
+        return self.type == RELATIVE
 
     def is_value(self) -> bool:
-        return self.type == KWord.Types.VALUE
+        return self.type == VALUE
 
     def assert_value(self):
         if not self.is_value():
@@ -204,44 +127,10 @@ class KWord(object):
                 f"KWord {self.value} must not be a absolute address in this context")
 
     def assert_not_ambiguous(self):
-        if self.is_absolute_addr() and (self & 0x80000000) == 0:
+        topBit = int(self) & 0x80000000
+        if self.type == ABSOLUTE and topBit == 0:
             raise InvalidOperationException(
                 f"{self.value} is ambiguous: absolute, top bit not set")
-        if self.is_relative_addr() and (self & 0x80000000) != 0:
+        if self.type == RELATIVE and topBit != 0:
             raise InvalidOperationException(
                 f"{self.value} is ambiguous: relative, top bit set")
-
-    def __retrieve_value(self, other: KWord) -> int:
-        if isinstance(other, KWord):
-            return other.value
-        elif isinstance(other, int):
-            return self.__expand(self.__clamp(other))
-        else:
-            raise TypeError(
-                f"Can't assign {type(other)} to class of type KWord using an operator")
-
-    def __expand(self, value: int) -> int:
-        if isinstance(value, KWord):
-            value = value.value
-        else:
-            value = int(value)
-        if self.signed:
-            if value > 0x7FFFFFFF:
-                value -= 0x100000000
-            elif value < 0:
-                value += 0x100000000
-        return value
-
-    @staticmethod
-    def __clamp(value: int) -> int:
-        if isinstance(value, KWord):
-            value = value.value
-        else:
-            value = int(value)
-        if value > 0x1FFFFFFFF or value < -0x1FFFFFFFF:
-            raise ValueError(f"'{value}' is too extreme to clamp")
-        elif value > 0xFFFFFFFF:
-            value -= 0x100000000
-        elif value < 0:
-            value += 0x100000000
-        return value
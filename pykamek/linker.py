@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import mmap
+import struct
+from array import array
 from io import BytesIO
 from pathlib import Path
 from typing import Tuple
@@ -14,12 +17,14 @@ from pykamek.elfenums import ELFFlags
 from pykamek.exceptions import (AlreadyExistsException, AlreadyLinkedException,
                         InvalidDataException, InvalidOperationException,
                         InvalidTableLinkageException)
-from pykamek.ioreader import (read_sbyte, read_sint16, read_sint32, read_ubyte,
-                      read_uint16, read_uint32, write_sbyte, write_sint16,
-                      write_sint32, write_ubyte, write_uint16, write_uint32)
 from pykamek.kmhooks import HookData
 from pykamek.kmword import KWord
 
+_STB_LOCAL, _STB_GLOBAL, _STB_WEAK = 0, 1, 2
+_SHN_UNDEF = 0
+_SHN_LORESERVE = 0xFF00
+_SHN_ABS = 0xFFF1
+
 
 class Linker(AddressMapper):
 
@@ -36,10 +41,10 @@ class Linker(AddressMapper):
             return f"Symbol container; {self.__repr__()}"
 
     class RelocFixup(object):
-        def __init__(self, reloctype: ELFFlags.Reloc, source: KWord, dest: KWord):
+        def __init__(self, reloctype: ELFFlags.Reloc, source: int, dest: int):
             self.type = reloctype
-            self.source = KWord(source, source.type)
-            self.dest = KWord(dest, dest.type)
+            self.source = KWord(source, KWord.Types.ABSOLUTE)
+            self.dest = KWord(dest, KWord.Types.ABSOLUTE)
 
         def __repr__(self) -> str:
             return f"repr=({self.type}, {self.source.value:X}, {self.dest.value:X})"
@@ -58,6 +63,8 @@ class Linker(AddressMapper):
 
         self._linked = False
         self._modules = {}
+        self._mmaps = {}
+        self._sections = {}
         self._binaries = []
         self._sectionBases = {}
         self._location = 0
@@ -67,18 +74,22 @@ class Linker(AddressMapper):
 
         self._globalSymbols = {}
         self._localSymbols = {}
+        self._resolvedSymbols = {}
         self._symbolTableContents = {}
         self._externSymbols = {}
         self._symbolSizes = {}
 
         # RELOCATIONS
 
-        self._fixups = []
+        self._fixupTypes = array("B")
+        self._fixupSources = array("I")
+        self._fixupDests = array("I")
 
         # KAMEK HOOKS
 
         self._kamekRelocs = {}
         self._kamekHooks = []
+        self._hookSymbols = []
 
         # OTHER
 
@@ -92,11 +103,22 @@ class Linker(AddressMapper):
 
     def __iadd__(self, elf: Path):
         print(f"Adding {elf} as object")
-        self._modules[elf] = ELFFile(BytesIO(elf.read_bytes()))
+        with open(elf, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._mmaps[elf] = mm
+        self._modules[elf] = ELFFile(mm)
+        self._sections[elf] = list(self._modules[elf].iter_sections())
+        return self
 
     def __isub__(self, elf: Path):
         print(f"Removing {elf} from object list")
         self._modules.pop(elf, f"{elf} does not exist in the current container")
+        self._sections.pop(elf, None)
+        mm = self._mmaps.pop(elf, None)
+        if mm is not None:
+            mm.close()
+        return self
 
     @property
     def outputSize(self) -> int:
@@ -106,17 +128,22 @@ class Linker(AddressMapper):
     def bssSize(self) -> int:
         return self.bssEnd - self.bssStart
 
+    @property
+    def fixups(self) -> Tuple[Linker.RelocFixup]:
+        for _type, source, dest in zip(self._fixupTypes, self._fixupSources,
+                                       self._fixupDests):
+            yield Linker.RelocFixup(_type, source, dest)
+
     @property
     def modules(self) -> Tuple[Path, ELFFile]:
-        for _key in self._modules:
-            yield _key, self._modules[_key]
+        return iter(self._modules.items())
 
     # """ MODULES """
 
     def add_module(self, elf: Path):
         if self._linked:
             raise AlreadyLinkedException("This linker has already been linked")
-        if elf in self._modules.keys():
+        if elf in self._modules:
             raise AlreadyExistsException("This module is already part of this linker")
 
         self.__iadd__(elf)
@@ -160,32 +187,49 @@ class Linker(AddressMapper):
 
     def _import_sections(self, prefix: str, alignEnd: int = 4, padding: int = 0):
         imported = False
-        baseAddress = self._location.value
+        loc = self._location
+        baseAddress = loc
 
-        for elf in self._modules.values():
-            for section in elf.iter_sections():
+        for elfpath, sections in self._sections.items():
+            mmview = memoryview(self._mmaps[elfpath])
+            for section in sections:
                 if not section.name.startswith(prefix):
                     continue
 
-                self._sectionBases[self.__get_section_key(section)] = KWord(self._location, KWord.Types.ABSOLUTE)
-                sectionPadding = b"\x00" * (4 - (self._location.value % 4))
-                self._location += (section.data_size + 3) & -4
-                self._binaries.append(BytesIO(section.data() + sectionPadding))
+                header = section.header
+                size = (section.data_size + 3) & -4
+
+                # Slice the mapping directly where possible; NOBITS and
+                # compressed sections still go through pyelftools
+                if header["sh_type"] == "SHT_NOBITS" or section.compressed:
+                    data = section.data()
+                else:
+                    offset = header["sh_offset"]
+                    data = mmview[offset:offset + header["sh_size"]]
+
+                self._sectionBases[self.__get_section_key(section)] = loc
+                loc += size
+                self._binaries.append(data if len(data) == size else
+                                      bytes(data) + b"\x00" * (size - len(data)))
                 imported = True
-        
+
         if imported:
             self._externSymbols[f"_f_{prefix[1:]}"] = baseAddress
-            self._externSymbols[f"_e_{prefix[1:]}"] = self._location.value - padding
-            self._location += padding
-            if alignEnd > 0 and self._location.value % alignEnd != 0:
-                padlen = alignEnd - (self._location.value % alignEnd) + padding
-                self._location = (self._location + (alignEnd-1)) & -alignEnd
-                self._binaries.append(BytesIO(b"\x00" * padlen))
+            self._externSymbols[f"_e_{prefix[1:]}"] = loc - padding
+            loc += padding
+            if alignEnd > 0 and loc % alignEnd != 0:
+                padlen = alignEnd - (loc % alignEnd) + padding
+                loc = (loc + (alignEnd - 1)) & -alignEnd
+                self._binaries.append(b"\x00" * padlen)
+
+        self._location = loc
 
 
     def _collect_sections(self):
-        self._location = KWord(self.baseAddress, KWord.Types.ABSOLUTE)
-        self.outputStart.value = self._location.value
+        # The cursor stays a plain int through the import loops; it is
+        # only materialized as a KWord at the block boundaries below
+        self._location = int(self.baseAddress)
+        self.outputStart = KWord(self._location, KWord.Types.ABSOLUTE)
 
         self._import_sections(".init")
         self._import_sections(".fini")
@@ -195,48 +239,54 @@ class Linker(AddressMapper):
         self._import_sections(".rodata", alignEnd=32)
         self._import_sections(".data", alignEnd=32)
 
-        self.outputEnd.value = self._location.value
+        self.outputEnd = KWord(self._location, KWord.Types.ABSOLUTE)
 
-        self.bssStart.value = self.outputEnd.value
+        self.bssStart = KWord(self.outputEnd, KWord.Types.ABSOLUTE)
         self._import_sections(".bss", alignEnd=32)
-        self.bssEnd.value = self._location.value
+        self.bssEnd = KWord(self._location, KWord.Types.ABSOLUTE)
 
-        self.kamekStart.value = self._location.value
+        self.kamekStart = KWord(self._location, KWord.Types.ABSOLUTE)
         self._import_sections(".kamek")
-        self.kamekEnd.value = self._location.value
+        self.kamekEnd = KWord(self._location, KWord.Types.ABSOLUTE)
 
-        for binary in self._binaries:
-            self._memory.write(binary.getvalue())
+        self._memory = BytesIO(b"".join(self._binaries))
+        # Release the mmap-backed views so module removal can close the maps
+        self._binaries.clear()
 
     # """ SYMBOLS """
 
     def _resolve_symbol(self, elfpath: str, name: str) -> Linker.Symbol:
-        _locals = self._localSymbols[elfpath]
-        if name in _locals:
-            return _locals[name]
-        elif name in self._globalSymbols:
-            return self._globalSymbols[name]
-        elif name in self._externSymbols:
-            return Linker.Symbol(KWord(self._externSymbols[name], KWord.Types.ABSOLUTE))
-
-        raise InvalidDataException(f"Undefined symbol \"{name}\"")
+        try:
+            return self._resolvedSymbols[elfpath][name]
+        except KeyError:
+            raise InvalidDataException(f"Undefined symbol \"{name}\"")
 
     def _build_symbol_tables(self):
         for path, elf in self.modules:
             _locals = {}
+            sections = self._sections[path]
 
-            for section in elf.iter_sections():
+            for section in sections:
                 if not isinstance(section, SymbolTableSection):
                     continue
 
                 strTabIdx = section.header["sh_link"]
-                if strTabIdx <= 0 or strTabIdx >= elf.num_sections():
+                if strTabIdx <= 0 or strTabIdx >= len(sections):
                     raise InvalidTableLinkageException("Symbol table is not linked to a string table")
 
-                strTab = elf.get_section(strTabIdx)
+                strTab = sections[strTabIdx]
 
                 self._symbolTableContents[self.__get_section_key(section)] = self._parse_symbol_table(path, elf, section, strTab, _locals)
 
+        # One flattened name -> Symbol dict per module (locals shadow
+        # globals shadow externs) so symbol resolution is a single probe
+        _externs = {name: Linker.Symbol(KWord(addr, KWord.Types.ABSOLUTE))
+                    for name, addr in self._externSymbols.items()}
+
+        for _elfkey in self._modules:
+            self._resolvedSymbols[_elfkey] = {**_externs, **self._globalSymbols,
+                                              **self._localSymbols[_elfkey]}
+
     def _parse_symbol_table(self, elfpath: str, elf: ELFFile, symTab: SymbolTableSection, strTab: StringTableSection, _locals: dict) -> list:
         if symTab.header["sh_entsize"] != 16:
             raise InvalidDataException("Invalid symbol table format (sh_entsize != 16)")
@@ -244,75 +294,91 @@ class Linker(AddressMapper):
             raise InvalidDataException("String table does not have type SHT_STRTAB")
 
         _symbolNames = []
+        _strData = strTab.data()
+        _sections = self._sections[elfpath]
+        _sectionBases = self._sectionBases
+        _globalSymbols = self._globalSymbols
+        _symbolSizes = self._symbolSizes
+        _sectionKey = self.__get_section_key
+
+        # Elf32 big-endian symbol entries; entsize is validated above
+        for st_name, st_value, st_size, st_info, _, st_shndx in \
+                struct.iter_unpack(">IIIBBH", symTab.data()):
+            if st_name == 0:
+                name = ""
+            else:
+                name = _strData[st_name:_strData.index(b"\x00", st_name)].decode()
 
-        for symbol in symTab.iter_symbols():
-            name = symbol.name
-            st_value = symbol["st_value"]
-            st_size = symbol["st_size"]
-            st_info = symbol["st_info"]
-            st_shndx = symbol["st_shndx"]
-            
             _symbolNames.append(name)
 
-            if len(name) == 0 or st_shndx == "SHN_UNDEF":
+            if not name or st_shndx == _SHN_UNDEF:
                 continue
 
-
             # What location is this referencing?
-            if isinstance(st_shndx, int): # Reference
-                refSection = elf.get_section(st_shndx)
-                _refkey = self.__get_section_key(refSection)
+            if st_shndx < _SHN_LORESERVE: # Reference
+                _refkey = _sectionKey(_sections[st_shndx])
 
-                if _refkey not in self._sectionBases:
+                sectionBase = _sectionBases.get(_refkey)
+                if sectionBase is None:
                     continue # Skip past unwanted symbols
 
-                addr = KWord(self._sectionBases[_refkey] + st_value,
-                             self._sectionBases[_refkey].type)
-            elif st_shndx == "SHN_ABS": # Absolute symbol
-                refSection = None
+                addr = KWord(sectionBase + st_value, KWord.Types.ABSOLUTE)
+            elif st_shndx == _SHN_ABS: # Absolute symbol
                 addr = KWord(st_value, KWord.Types.ABSOLUTE)
             else:
                 raise InvalidDataException("Unknown section index found in symbol table")
 
-            if st_info["bind"] == "STB_LOCAL":
+            bind = st_info >> 4
+            if bind == _STB_LOCAL:
                 if name in _locals:
                     raise InvalidDataException(f"Redefinition of local symbol {name}")
-                
+
                 _locals[name] = Linker.Symbol(addr, st_size)
-                self._symbolSizes[addr] = st_size
+                _symbolSizes[addr] = st_size
+
+                if name.startswith("_kHook"):
+                    self._hookSymbols.append(addr)
 
-            elif st_info["bind"] == "STB_GLOBAL":
-                if name in self._globalSymbols and not self._globalSymbols[name].isWeak:
+            elif bind == _STB_GLOBAL:
+                prev = _globalSymbols.get(name)
+                if prev is not None and not prev.isWeak:
                     raise InvalidDataException(f"Redefinition of global symbol {name}")
 
-                self._globalSymbols[name] = Linker.Symbol(addr, st_size)
-                self._symbolSizes[addr] = st_size
-                
-            elif st_info["bind"] == "STB_WEAK":
-                if name not in self._globalSymbols:
-                    self._globalSymbols[name] = Linker.Symbol(addr, st_size, isWeak=True)
-                    self._symbolSizes[addr] = st_size
-            
+                _globalSymbols[name] = Linker.Symbol(addr, st_size)
+                _symbolSizes[addr] = st_size
+
+            elif bind == _STB_WEAK:
+                if name not in _globalSymbols:
+                    _globalSymbols[name] = Linker.Symbol(addr, st_size, isWeak=True)
+                    _symbolSizes[addr] = st_size
+
         self._localSymbols[elfpath] = _locals
-        return _symbolNames
+        return tuple(_symbolNames)
 
     # """ RELOCATIONS """
 
     def _process_relocations(self):
         for _elfkey in self._modules:
             elf = self._modules[_elfkey]
-            for _ in [s for s in elf.iter_sections() if s.header["sh_type"] == "SHT_REL"]:
-                raise InvalidDataException("OH CRAP ;P")
-
-            for section in [s for s in elf.iter_sections() if s.header["sh_type"] == "SHT_RELA"]:
-                if section.header["sh_info"] <= 0 or section.header["sh_info"] >= elf.num_sections():
+            sections = self._sections[_elfkey]
+
+            _relaSections = []
+            for section in sections:
+                _shtype = section.header["sh_type"]
+                if _shtype == "SHT_REL":
+                    raise InvalidDataException("OH CRAP ;P")
+                elif _shtype == "SHT_RELA":
+                    _relaSections.append(section)
+
+            for section in _relaSections:
+                if section.header["sh_info"] <= 0 or section.header["sh_info"] >= len(sections):
                     raise InvalidDataException("Rela table is not linked to a section")
-                if section.header["sh_link"] <= 0 or section.header["sh_link"] >= elf.num_sections():
+                if section.header["sh_link"] <= 0 or section.header["sh_link"] >= len(sections):
                     raise InvalidDataException("Rela table is not linked to a symbol table")
 
-                affected = elf.get_section(section.header["sh_info"])
-                symTab = elf.get_section(section.header["sh_link"])
-                
+                affected = sections[section.header["sh_info"]]
+                symTab = sections[section.header["sh_link"]]
+
                 self._process_rela_section(_elfkey, elf, section, affected, symTab)
 
     def _process_rela_section(self, elfpath: str, elf: ELFFile, relocs: RelocationSection, section: Section, symTab: SymbolTableSection):
@@ -321,56 +387,79 @@ class Linker(AddressMapper):
         if not isinstance(symTab, SymbolTableSection):
             raise InvalidDataException("Symbol table does not have type SHT_SYMTAB")
 
-        for relocation in relocs.iter_relocations():
-            reloc = relocation["r_info"] & 0xFF
-            symIndex = relocation["r_info"] >> 8
-            _symkey = self.__get_section_key(section)
+        # Elf32 big-endian rela entries; entsize is validated above and the
+        # toolchain output this linker consumes is always PPC32 BE
+        _relaData = relocs.data()
+
+        _symkey = self.__get_section_key(section)
+        if _symkey not in self._sectionBases:
+            for _, info, _ in struct.iter_unpack(">IIi", _relaData):
+                if info >> 8 == 0:
+                    raise InvalidDataException("Linking to undefined symbol")
+            return
+
+        _symbolNames = self._symbolTableContents[self.__get_section_key(symTab)]
+        _sectionBase = self._sectionBases[_symkey]
+        _resolved = self._resolvedSymbols[elfpath]
+        _appendType = self._fixupTypes.append
+        _appendSource = self._fixupSources.append
+        _appendDest = self._fixupDests.append
+        _kamekRelocs = self._kamekRelocs
+        _kamekStart = int(self.kamekStart)
+        _kamekEnd = int(self.kamekEnd)
+        _R_ADDR32 = ELFFlags.Reloc.R_PPC_ADDR32
+
+        for r_offset, info, r_addend in struct.iter_unpack(">IIi", _relaData):
+            reloc = info & 0xFF
+            symIndex = info >> 8
 
             if symIndex == 0:
                 raise InvalidDataException("Linking to undefined symbol")
-            elif _symkey not in self._sectionBases:
-                continue
 
-            symName = self._symbolTableContents[self.__get_section_key(symTab)][symIndex]
+            symName = _symbolNames[symIndex]
+            symbol = _resolved.get(symName)
+            if symbol is None:
+                raise InvalidDataException(f"Undefined symbol \"{symName}\"")
 
-            source = KWord(self._sectionBases[_symkey].value + relocation["r_offset"], KWord.Types.ABSOLUTE)
-            dest = KWord(self._resolve_symbol(elfpath, symName).address.value + relocation["r_addend"], KWord.Types.ABSOLUTE)
+            source = _sectionBase + r_offset
+            dest = symbol.address.value + r_addend
 
-            if not self._kamek_use_reloc(reloc, source, dest):
-                self._fixups.append(Linker.RelocFixup(reloc, source, dest))
+            if _kamekStart <= source < _kamekEnd:
+                if reloc != _R_ADDR32:
+                    raise InvalidOperationException("Unsupported relocation type in the Kamek hook data section")
+                _kamekRelocs[source] = KWord(dest, KWord.Types.ABSOLUTE)
+            else:
+                _appendType(reloc)
+                _appendSource(source)
+                _appendDest(dest & 0xFFFFFFFF)
 
     # """ KAMEK HOOKS """
 
-    def _kamek_use_reloc(self, _type: ELFFlags.Reloc, source: KWord, dest: KWord):
-        if source < self.kamekStart or source >= self.kamekEnd:
-            return False
-        elif _type != ELFFlags.Reloc.R_PPC_ADDR32:
-            raise InvalidOperationException("Unsupported relocation type in the Kamek hook data section")
-
-        self._kamekRelocs[source] = dest
-        return True
-
     def _process_hooks(self):
-        for _elfkey in self._modules:
-            for _symbolkey in self._localSymbols[_elfkey]:
-                if _symbolkey.startswith("_kHook"):
-                    cmdAddr = self._localSymbols[_elfkey][_symbolkey].address
-
-                    self._memory.seek(cmdAddr.value - self.baseAddress.value)
-                    argCount = read_uint32(self._memory)
-                    _type = read_uint32(self._memory)
-                    args = []
-
-                    for i in range(argCount):
-                        argAddr = cmdAddr + (8 + (i << 2))
-                        if argAddr in self._kamekRelocs:
-                            args.append(self._kamekRelocs[argAddr])
-                        else:
-                            self._memory.seek(argAddr.value - self.baseAddress.value)
-                            args.append(KWord(read_uint32(self._memory), KWord.Types.VALUE))
-                    self._kamekHooks.append(HookData(_type, args))
+        _memoryView = self._memory.getbuffer()
+        _baseAddress = self.baseAddress.value
+        _kamekRelocs = self._kamekRelocs
+
+        for hookAddr in self._hookSymbols:
+            cmdAddr = hookAddr.value
+            offset = cmdAddr - _baseAddress
+            argCount, _type = struct.unpack_from(">II", _memoryView, offset)
+            words = struct.unpack_from(f">{argCount}I", _memoryView,
+                                       offset + 8)
+
+            args = []
+            for i, word in enumerate(words):
+                value = _kamekRelocs.get(cmdAddr + 8 + (i << 2))
+                args.append(KWord(word, KWord.Types.VALUE)
+                            if value is None else value)
+            self._kamekHooks.append(HookData(_type, args))
 
     @staticmethod
-    def __get_section_key(section) -> str:
-        return "".join([str(data) for data in section.header.values()])
+    def __get_section_key(section) -> tuple:
+        # pyelftools builds a fresh Section object per get_section() call,
+        # so key on the owning file plus the header fields that pin the
+        # section's identity instead of object identity
+        header = section.header
+        return (id(section.elffile), header["sh_name"], header["sh_offset"],
+                header["sh_size"])
 